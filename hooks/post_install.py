@@ -2,8 +2,8 @@
 DHCP Module - Post-install Hook
 
 Executes after module installation to configure system for DHCP:
-1. Create /etc/dhcp directory
-2. Stop any running isc-dhcp-server to avoid conflicts
+1. Stop any running isc-dhcp-server to avoid conflicts (in background)
+2. Create /etc/dhcp directory
 3. Write initial empty config header
 """
 import subprocess
@@ -25,7 +25,18 @@ def run():
     logger.info("Running DHCP post-install hook...")
     errors = []
 
-    # 1. Create /etc/dhcp directory
+    # 1. Stop isc-dhcp-server if running (avoid conflicts during setup).
+    # Runs in the background while the filesystem steps below proceed.
+    stop_proc = None
+    try:
+        stop_proc = subprocess.Popen(
+            ["systemctl", "stop", "isc-dhcp-server"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except Exception as e:
+        logger.warning(f"Could not stop isc-dhcp-server: {e}")
+
+    # 2. Create /etc/dhcp directory
     dhcp_dir = Path("/etc/dhcp")
     try:
         dhcp_dir.mkdir(parents=True, exist_ok=True)
@@ -35,16 +46,6 @@ def run():
     except Exception as e:
         errors.append(f"Failed to create {dhcp_dir}: {e}")
 
-    # 2. Stop isc-dhcp-server if running (avoid conflicts during setup)
-    try:
-        subprocess.run(
-            ["systemctl", "stop", "isc-dhcp-server"],
-            capture_output=True, text=True
-        )
-        logger.info("Stopped isc-dhcp-server (if was running)")
-    except Exception as e:
-        logger.warning(f"Could not stop isc-dhcp-server: {e}")
-
     # 3. Write initial config header
     conf_path = Path("/etc/dhcp/dhcpd.conf")
     try:
@@ -79,13 +80,31 @@ def run():
     defaults_path = Path("/etc/default/isc-dhcp-server")
     try:
         # Set empty interfaces initially (will be updated when subnets are created)
-        defaults_path.write_text('INTERFACESv4=""\nINTERFACESv6=""\n')
-        logger.info(f"Wrote defaults to {defaults_path}")
+        defaults = 'INTERFACESv4=""\nINTERFACESv6=""\n'
+        try:
+            current = defaults_path.read_bytes()
+        except FileNotFoundError:
+            current = None
+        if current != defaults.encode():
+            defaults_path.write_text(defaults)
+            logger.info(f"Wrote defaults to {defaults_path}")
+        else:
+            logger.info(f"Defaults already up to date in {defaults_path}")
     except PermissionError:
         errors.append(f"Permission denied writing to {defaults_path}")
     except Exception as e:
         errors.append(f"Failed to write defaults: {e}")
 
+    # Wait for the service stop before reporting
+    if stop_proc is not None:
+        try:
+            stop_proc.wait(timeout=10)
+            logger.info("Stopped isc-dhcp-server (if was running)")
+        except subprocess.TimeoutExpired:
+            stop_proc.kill()
+            stop_proc.wait()
+            logger.warning("Timed out waiting for isc-dhcp-server to stop")
+
     # Report results
     if errors:
         for err in errors:
@@ -2,8 +2,9 @@
 DHCP Module - Pre-uninstall Hook
 
 Executes before module uninstallation:
-1. Stop isc-dhcp-server service
+1. Stop and disable isc-dhcp-server service
 2. Backup current configuration
+3. Remove lease files
 """
 import subprocess
 import logging
@@ -25,28 +26,18 @@ def run():
     logger.info("Running DHCP pre-uninstall hook...")
     errors = []
 
-    # 1. Stop isc-dhcp-server
-    logger.info("Stopping isc-dhcp-server...")
+    # 1. Stop and disable isc-dhcp-server (single systemctl call)
+    logger.info("Stopping and disabling isc-dhcp-server...")
     try:
         subprocess.run(
-            ["systemctl", "stop", "isc-dhcp-server"],
-            capture_output=True, text=True, timeout=15
+            ["systemctl", "disable", "--now", "isc-dhcp-server"],
+            capture_output=True, text=True, timeout=30
         )
-        logger.info("isc-dhcp-server stopped")
+        logger.info("isc-dhcp-server stopped and disabled")
     except Exception as e:
         errors.append(f"Failed to stop service: {e}")
 
-    # 2. Disable isc-dhcp-server
-    try:
-        subprocess.run(
-            ["systemctl", "disable", "isc-dhcp-server"],
-            capture_output=True, text=True
-        )
-        logger.info("isc-dhcp-server disabled")
-    except Exception as e:
-        logger.warning(f"Could not disable service: {e}")
-
-    # 3. Backup current config
+    # 2. Backup current config
     conf_path = Path("/etc/dhcp/dhcpd.conf")
     if conf_path.exists():
         try:
@@ -54,12 +45,13 @@ def run():
             backup_path = conf_path.with_name(
                 f"dhcpd.conf.madmin_backup_{timestamp}"
             )
+            # copy2 copies in-kernel via os.sendfile on Linux
             shutil.copy2(conf_path, backup_path)
             logger.info(f"Config backed up to {backup_path}")
         except Exception as e:
             errors.append(f"Failed to backup config: {e}")
 
-    # 4. Clean up lease files
+    # 3. Clean up lease files
     for lease_file in [
         Path("/var/lib/dhcp/dhcpd.leases"),
         Path("/var/lib/dhcp/dhcpd.leases~"),
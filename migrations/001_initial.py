@@ -32,5 +32,6 @@ async def downgrade(session: AsyncSession) -> None:
     tables = ["dhcp_option", "dhcp_host", "dhcp_subnet"]
 
     async with engine.begin() as conn:
-        for table in tables:
-            await conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+        await conn.execute(
+            text(f"DROP TABLE IF EXISTS {', '.join(tables)} CASCADE")
+        )
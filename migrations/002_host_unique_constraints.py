@@ -0,0 +1,68 @@
+"""
+DHCP Module - Host Uniqueness Migration
+
+Adds unique constraints on (subnet_id, mac_address) and
+(subnet_id, ip_address) to dhcp_host. Fresh installs already get them
+from 001 via create_all; existing ones are checked for duplicates first.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+CONSTRAINTS = [
+    ("uq_host_subnet_mac", "mac_address"),
+    ("uq_host_subnet_ip", "ip_address"),
+]
+
+
+async def upgrade(session: AsyncSession) -> None:
+    """Add unique constraints to dhcp_host."""
+    from core.database import engine
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        for name, column in CONSTRAINTS:
+            result = await conn.execute(
+                text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+                {"name": name}
+            )
+            if result.first() is not None:
+                continue
+
+            # Existing reservations may already collide (update_host did not
+            # check for duplicates): report them instead of a raw DB error
+            result = await conn.execute(text(
+                f"SELECT s.name, h.{column}, count(*) "
+                f"FROM dhcp_host h JOIN dhcp_subnet s ON s.id = h.subnet_id "
+                f"GROUP BY s.name, h.subnet_id, h.{column} "
+                f"HAVING count(*) > 1"
+            ))
+            duplicates = result.all()
+            if duplicates:
+                details = ", ".join(
+                    f"subnet '{subnet}': {value} ({count} hosts)"
+                    for subnet, value, count in duplicates
+                )
+                raise RuntimeError(
+                    f"Cannot add {name}: duplicate {column} reservations "
+                    f"found ({details}). Edit or delete the duplicate "
+                    f"reservations, then re-run the module upgrade."
+                )
+
+            await conn.execute(text(
+                f"ALTER TABLE dhcp_host ADD CONSTRAINT {name} "
+                f"UNIQUE (subnet_id, {column})"
+            ))
+
+    print("DHCP host unique constraints created")
+
+
+async def downgrade(session: AsyncSession) -> None:
+    """Drop dhcp_host unique constraints."""
+    from core.database import engine
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        for name, _ in CONSTRAINTS:
+            await conn.execute(text(
+                f"ALTER TABLE dhcp_host DROP CONSTRAINT IF EXISTS {name}"
+            ))
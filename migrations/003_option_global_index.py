@@ -0,0 +1,30 @@
+"""
+DHCP Module - Global Options Index Migration
+
+Adds a partial index on dhcp_option for global options (subnet_id IS NULL).
+Fresh installs already get it from 001 via create_all.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def upgrade(session: AsyncSession) -> None:
+    """Create the partial index for global options."""
+    from core.database import engine
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_dhcp_option_global "
+            "ON dhcp_option (subnet_id) WHERE subnet_id IS NULL"
+        ))
+
+    print("DHCP global options index created")
+
+
+async def downgrade(session: AsyncSession) -> None:
+    """Drop the partial index for global options."""
+    from core.database import engine
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX IF EXISTS ix_dhcp_option_global"))
@@ -7,6 +7,7 @@ Pydantic schemas for API request/response validation.
 from typing import Optional, List
 from datetime import datetime
 from sqlmodel import Field, SQLModel, Relationship, Column, JSON
+from sqlalchemy import Index, UniqueConstraint, text
 import uuid
 
 
@@ -44,6 +45,10 @@ class DhcpSubnet(SQLModel, table=True):
 class DhcpHost(SQLModel, table=True):
     """Static reservation (MAC → IP)."""
     __tablename__ = "dhcp_host"
+    __table_args__ = (
+        UniqueConstraint("subnet_id", "mac_address", name="uq_host_subnet_mac"),
+        UniqueConstraint("subnet_id", "ip_address", name="uq_host_subnet_ip"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     subnet_id: uuid.UUID = Field(foreign_key="dhcp_subnet.id", index=True)
@@ -60,6 +65,13 @@ class DhcpHost(SQLModel, table=True):
 class DhcpOption(SQLModel, table=True):
     """Custom DHCP option (global or per-subnet)."""
     __tablename__ = "dhcp_option"
+    __table_args__ = (
+        # Partial index for the common "global options" lookup
+        Index(
+            "ix_dhcp_option_global", "subnet_id",
+            postgresql_where=text("subnet_id IS NULL")
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     subnet_id: Optional[uuid.UUID] = Field(
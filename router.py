@@ -3,12 +3,15 @@ DHCP Module - API Router
 
 FastAPI endpoints for DHCP server management.
 """
+import asyncio
 import logging
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete, insert, bindparam
+from sqlalchemy.exc import IntegrityError
 
 from core.database import get_session
 from core.auth.models import User
@@ -21,44 +24,84 @@ from .models import (
     DhcpOptionCreate, DhcpOptionRead,
     DhcpLeaseInfo, DhcpServiceStatus
 )
-from .service import dhcp_service
+from .service import dhcp_service, make_etag
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Permission dependencies, built once and shared by all endpoints
+require_view = require_permission("dhcp.view")
+require_manage = require_permission("dhcp.manage")
+require_reservations = require_permission("dhcp.reservations")
+
+
+async def _get_or_404(session: AsyncSession, model, pk: UUID, detail: str):
+    """Load a row by primary key (identity map first) or raise 404."""
+    obj = await session.get(model, pk)
+    if obj is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+    return obj
+
+
+def _json_response(request: Request, payload: bytes, etag: str) -> Response:
+    """
+    Return a JSON payload with its ETag, or 304 Not Modified if the client
+    already holds it (If-None-Match, weak comparison per RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    # Weak comparison: ignore W/ so tags weakened by a proxy still match
+    tags = [
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ]
+    if etag in tags or "*" in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag}
+        )
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
 
 # ============================================================
 #  SYSTEM / SERVICE
 # ============================================================
 
+def _check_config_valid() -> Optional[bool]:
+    """Validate config syntax, returning None if the check itself fails."""
+    try:
+        valid, _ = dhcp_service.validate_config()
+        return valid
+    except Exception:
+        return None
+
+
 @router.get("/status", response_model=DhcpServiceStatus)
 async def get_status(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """Get DHCP service status and statistics."""
-    svc = dhcp_service.get_service_status()
-
-    # Count subnets
-    result = await session.execute(select(func.count(DhcpSubnet.id)))
-    total_subnets = result.scalar() or 0
-
-    # Count hosts
-    result = await session.execute(select(func.count(DhcpHost.id)))
-    total_hosts = result.scalar() or 0
-
-    # Count active leases
-    leases = dhcp_service.parse_leases()
+    # Service status, lease parsing and config validation are blocking
+    # (subprocess / file I/O): run them in threads alongside the DB query.
+    svc, leases, config_valid, result = await asyncio.gather(
+        asyncio.to_thread(dhcp_service.get_service_status),
+        asyncio.to_thread(dhcp_service.parse_leases),
+        asyncio.to_thread(_check_config_valid),
+        # Count subnets and hosts in a single round-trip
+        session.execute(select(
+            select(func.count(DhcpSubnet.id)).scalar_subquery(),
+            select(func.count(DhcpHost.id)).scalar_subquery()
+        ))
+    )
+    total_subnets, total_hosts = result.one()
     total_leases = len(leases)
 
-    # Validate config
-    config_valid = None
-    try:
-        valid, _ = dhcp_service.validate_config()
-        config_valid = valid
-    except:
-        pass
-
     return DhcpServiceStatus(
         running=svc["running"],
         enabled=svc["enabled"],
@@ -72,7 +115,7 @@ async def get_status(
 
 @router.get("/interfaces")
 async def get_interfaces(
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """List available network interfaces."""
     interfaces = dhcp_service.get_physical_interfaces()
@@ -82,7 +125,7 @@ async def get_interfaces(
 @router.post("/apply")
 async def apply_config(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Generate config, validate, and restart service."""
     success, message = await dhcp_service.apply_config(session)
@@ -97,14 +140,14 @@ async def apply_config(
 @router.post("/start")
 async def start_service(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Start DHCP service (applies config first)."""
     # Check for enabled subnets
     result = await session.execute(
-        select(func.count(DhcpSubnet.id)).where(DhcpSubnet.enabled == True)
+        select(DhcpSubnet.id).where(DhcpSubnet.enabled == True).limit(1)
     )
-    if (result.scalar() or 0) == 0:
+    if result.scalar() is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Impossibile avviare: nessuna subnet abilitata configurata"
@@ -122,7 +165,7 @@ async def start_service(
 
 @router.post("/stop")
 async def stop_service(
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Stop DHCP service."""
     success, message = dhcp_service.stop_service()
@@ -137,14 +180,14 @@ async def stop_service(
 @router.post("/restart")
 async def restart_service(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Restart DHCP service (re-applies config)."""
     # Check for enabled subnets
     result = await session.execute(
-        select(func.count(DhcpSubnet.id)).where(DhcpSubnet.enabled == True)
+        select(DhcpSubnet.id).where(DhcpSubnet.enabled == True).limit(1)
     )
-    if (result.scalar() or 0) == 0:
+    if result.scalar() is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Impossibile riavviare: nessuna subnet abilitata configurata"
@@ -163,7 +206,7 @@ async def restart_service(
 @router.get("/config/preview")
 async def preview_config(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Preview the generated dhcpd.conf without applying."""
     config = await dhcp_service.generate_config(session)
@@ -172,7 +215,7 @@ async def preview_config(
 
 @router.get("/config/validate")
 async def validate_config(
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Validate current dhcpd.conf syntax."""
     valid, message = dhcp_service.validate_config()
@@ -186,46 +229,35 @@ async def validate_config(
 @router.get("/subnets", response_model=List[DhcpSubnetRead])
 async def list_subnets(
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """List all DHCP subnets."""
-    result = await session.execute(select(DhcpSubnet))
-    subnets = result.scalars().all()
-
     # Get active leases for enrichment
-    all_leases = dhcp_service.parse_leases()
+    all_leases = await asyncio.to_thread(dhcp_service.parse_leases)
+
+    # Load subnets with their host counts in a single statement
+    host_counts = (
+        select(DhcpHost.subnet_id, func.count(DhcpHost.id).label("cnt"))
+        .group_by(DhcpHost.subnet_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(DhcpSubnet, func.coalesce(host_counts.c.cnt, 0))
+        .outerjoin(host_counts, DhcpSubnet.id == host_counts.c.subnet_id)
+    )
 
     response = []
-    for subnet in subnets:
-        # Count hosts
-        host_result = await session.execute(
-            select(func.count(DhcpHost.id)).where(
-                DhcpHost.subnet_id == subnet.id
-            )
+    for subnet, host_count in result.all():
+        # Count leases in this subnet (from the single parse above)
+        subnet_leases = dhcp_service.get_leases_for_subnet(
+            subnet.network, all_leases
         )
-        host_count = host_result.scalar() or 0
-
-        # Count leases in this subnet
-        subnet_leases = dhcp_service.get_leases_for_subnet(subnet.network)
         active_leases = len(subnet_leases)
 
-        response.append(DhcpSubnetRead(
-            id=subnet.id,
-            name=subnet.name,
-            network=subnet.network,
-            range_start=subnet.range_start,
-            range_end=subnet.range_end,
-            gateway=subnet.gateway,
-            dns_servers=subnet.dns_servers,
-            domain_name=subnet.domain_name,
-            interface=subnet.interface,
-            lease_time=subnet.lease_time,
-            max_lease_time=subnet.max_lease_time,
-            enabled=subnet.enabled,
-            created_at=subnet.created_at,
-            host_count=host_count,
-            active_leases=active_leases
-        ))
+        response.append(DhcpSubnetRead.model_validate(subnet, update={
+            "host_count": host_count,
+            "active_leases": active_leases
+        }))
 
     return response
 
@@ -235,7 +267,7 @@ async def list_subnets(
 async def create_subnet(
     data: DhcpSubnetCreate,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Create a new DHCP subnet."""
     # Validate IP range
@@ -257,32 +289,28 @@ async def create_subnet(
 
     subnet = DhcpSubnet(**data.dict())
     session.add(subnet)
+
+    # id/created_at are client-side defaults: build the response from the
+    # in-memory object instead of re-fetching it after commit.
+    response = DhcpSubnetRead.model_validate(subnet, update={
+        "host_count": 0,
+        "active_leases": 0
+    })
     await session.commit()
-    await session.refresh(subnet)
 
-    return DhcpSubnetRead(
-        **subnet.dict(),
-        host_count=0,
-        active_leases=0
-    )
+    return response
 
 
 @router.get("/subnets/{subnet_id}", response_model=DhcpSubnetRead)
 async def get_subnet(
     subnet_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """Get a single subnet by ID."""
-    result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+    subnet = await _get_or_404(
+        session, DhcpSubnet, subnet_id, "Subnet not found"
     )
-    subnet = result.scalar_one_or_none()
-    if not subnet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subnet not found"
-        )
 
     # Count hosts
     host_result = await session.execute(
@@ -293,32 +321,27 @@ async def get_subnet(
     host_count = host_result.scalar() or 0
 
     # Count leases
-    subnet_leases = dhcp_service.get_leases_for_subnet(subnet.network)
-
-    return DhcpSubnetRead(
-        **subnet.dict(),
-        host_count=host_count,
-        active_leases=len(subnet_leases)
+    subnet_leases = await asyncio.to_thread(
+        dhcp_service.get_leases_for_subnet, subnet.network
     )
 
+    return DhcpSubnetRead.model_validate(subnet, update={
+        "host_count": host_count,
+        "active_leases": len(subnet_leases)
+    })
+
 
 @router.patch("/subnets/{subnet_id}", response_model=DhcpSubnetRead)
 async def update_subnet(
     subnet_id: UUID,
     data: DhcpSubnetUpdate,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Update a subnet."""
-    result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+    subnet = await _get_or_404(
+        session, DhcpSubnet, subnet_id, "Subnet not found"
     )
-    subnet = result.scalar_one_or_none()
-    if not subnet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subnet not found"
-        )
 
     update_data = data.dict(exclude_unset=True)
 
@@ -350,8 +373,6 @@ async def update_subnet(
         setattr(subnet, key, value)
 
     session.add(subnet)
-    await session.commit()
-    await session.refresh(subnet)
 
     host_result = await session.execute(
         select(func.count(DhcpHost.id)).where(
@@ -359,32 +380,31 @@ async def update_subnet(
         )
     )
     host_count = host_result.scalar() or 0
-    subnet_leases = dhcp_service.get_leases_for_subnet(subnet.network)
-
-    return DhcpSubnetRead(
-        **subnet.dict(),
-        host_count=host_count,
-        active_leases=len(subnet_leases)
+    subnet_leases = await asyncio.to_thread(
+        dhcp_service.get_leases_for_subnet, subnet.network
     )
 
+    # Build the response from the in-memory object (no post-commit refresh)
+    response = DhcpSubnetRead.model_validate(subnet, update={
+        "host_count": host_count,
+        "active_leases": len(subnet_leases)
+    })
+    await session.commit()
+
+    return response
+
 
 @router.delete("/subnets/{subnet_id}",
                status_code=status.HTTP_204_NO_CONTENT)
 async def delete_subnet(
     subnet_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Delete a subnet and its hosts/options."""
-    result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+    subnet = await _get_or_404(
+        session, DhcpSubnet, subnet_id, "Subnet not found"
     )
-    subnet = result.scalar_one_or_none()
-    if not subnet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subnet not found"
-        )
 
     await session.delete(subnet)
     await session.commit()
@@ -394,25 +414,48 @@ async def delete_subnet(
 #  HOSTS (RESERVATIONS)
 # ============================================================
 
+# Prebuilt statements for the host listing (bound per request)
+_SELECT_SUBNET_ID = select(DhcpSubnet.id).where(
+    DhcpSubnet.id == bindparam("subnet_id")
+)
+_SELECT_SUBNET_HOSTS = select(DhcpHost).where(
+    DhcpHost.subnet_id == bindparam("subnet_id")
+)
+
+
+def _host_conflict(error: IntegrityError) -> HTTPException:
+    """Map a dhcp_host unique constraint violation to a 409 response."""
+    if "uq_host_subnet_mac" in str(error.orig):
+        detail = "MAC address already reserved in this subnet"
+    elif "uq_host_subnet_ip" in str(error.orig):
+        detail = "IP address already reserved in this subnet"
+    else:
+        detail = "Reservation conflicts with an existing host"
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=detail
+    )
+
+
 @router.get("/subnets/{subnet_id}/hosts", response_model=List[DhcpHostRead])
 async def list_hosts(
     subnet_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """List static reservations for a subnet."""
     # Verify subnet exists
     result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+        _SELECT_SUBNET_ID, {"subnet_id": subnet_id}
     )
-    if not result.scalar_one_or_none():
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subnet not found"
         )
 
     result = await session.execute(
-        select(DhcpHost).where(DhcpHost.subnet_id == subnet_id)
+        _SELECT_SUBNET_HOSTS, {"subnet_id": subnet_id}
     )
     return result.scalars().all()
 
@@ -423,15 +466,15 @@ async def create_host(
     subnet_id: UUID,
     data: DhcpHostCreate,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.reservations"))
+    _user: User = Depends(require_reservations)
 ):
     """Create a static reservation."""
-    # Verify subnet exists
+    # Verify subnet exists (only its network is needed)
     result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+        select(DhcpSubnet.network).where(DhcpSubnet.id == subnet_id)
     )
-    subnet = result.scalar_one_or_none()
-    if not subnet:
+    subnet_network = result.scalar_one_or_none()
+    if subnet_network is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subnet not found"
@@ -446,36 +489,11 @@ async def create_host(
 
     # Validate IP in subnet
     if not dhcp_service.validate_ip_in_subnet(
-        data.ip_address, subnet.network
+        data.ip_address, subnet_network
     ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"IP {data.ip_address} is not in subnet {subnet.network}"
-        )
-
-    # Check for duplicate MAC or IP in this subnet
-    result = await session.execute(
-        select(DhcpHost).where(
-            DhcpHost.subnet_id == subnet_id,
-            DhcpHost.mac_address == data.mac_address.lower()
-        )
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="MAC address already reserved in this subnet"
-        )
-
-    result = await session.execute(
-        select(DhcpHost).where(
-            DhcpHost.subnet_id == subnet_id,
-            DhcpHost.ip_address == data.ip_address
-        )
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="IP address already reserved in this subnet"
+            detail=f"IP {data.ip_address} is not in subnet {subnet_network}"
         )
 
     host = DhcpHost(
@@ -486,10 +504,16 @@ async def create_host(
         description=data.description
     )
     session.add(host)
-    await session.commit()
-    await session.refresh(host)
 
-    return host
+    # Build the response from the in-memory object (no post-commit refresh)
+    response = DhcpHostRead.model_validate(host)
+    try:
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _host_conflict(e)
+
+    return response
 
 
 @router.patch("/subnets/{subnet_id}/hosts/{host_id}",
@@ -499,7 +523,7 @@ async def update_host(
     host_id: UUID,
     data: DhcpHostUpdate,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.reservations"))
+    _user: User = Depends(require_reservations)
 ):
     """Update a static reservation."""
     result = await session.execute(
@@ -529,11 +553,11 @@ async def update_host(
     # Validate IP if changed
     if "ip_address" in update_data:
         result = await session.execute(
-            select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+            select(DhcpSubnet.network).where(DhcpSubnet.id == subnet_id)
         )
-        subnet = result.scalar_one_or_none()
-        if subnet and not dhcp_service.validate_ip_in_subnet(
-            update_data["ip_address"], subnet.network
+        subnet_network = result.scalar_one_or_none()
+        if subnet_network and not dhcp_service.validate_ip_in_subnet(
+            update_data["ip_address"], subnet_network
         ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -544,10 +568,16 @@ async def update_host(
         setattr(host, key, value)
 
     session.add(host)
-    await session.commit()
-    await session.refresh(host)
 
-    return host
+    # Build the response from the in-memory object (no post-commit refresh)
+    response = DhcpHostRead.model_validate(host)
+    try:
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _host_conflict(e)
+
+    return response
 
 
 @router.delete("/subnets/{subnet_id}/hosts/{host_id}",
@@ -556,23 +586,21 @@ async def delete_host(
     subnet_id: UUID,
     host_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.reservations"))
+    _user: User = Depends(require_reservations)
 ):
     """Delete a static reservation."""
     result = await session.execute(
-        select(DhcpHost).where(
+        delete(DhcpHost).where(
             DhcpHost.id == host_id,
             DhcpHost.subnet_id == subnet_id
-        )
+        ).returning(DhcpHost.id)
     )
-    host = result.scalar_one_or_none()
-    if not host:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Host not found"
         )
 
-    await session.delete(host)
     await session.commit()
 
 
@@ -582,10 +610,12 @@ async def delete_host(
 
 @router.get("/leases", response_model=List[DhcpLeaseInfo])
 async def list_leases(
-    _user: User = Depends(require_permission("dhcp.view"))
+    request: Request,
+    _user: User = Depends(require_view)
 ):
     """List all active DHCP leases."""
-    return dhcp_service.parse_leases()
+    payload, etag = await asyncio.to_thread(dhcp_service.get_leases_json)
+    return _json_response(request, payload, etag)
 
 
 @router.get("/subnets/{subnet_id}/leases",
@@ -593,46 +623,63 @@ async def list_leases(
 async def list_subnet_leases(
     subnet_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """List active leases for a specific subnet."""
-    result = await session.execute(
-        select(DhcpSubnet).where(DhcpSubnet.id == subnet_id)
+    subnet = await _get_or_404(
+        session, DhcpSubnet, subnet_id, "Subnet not found"
     )
-    subnet = result.scalar_one_or_none()
-    if not subnet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subnet not found"
-        )
 
-    return dhcp_service.get_leases_for_subnet(subnet.network)
+    # Leases are already validated models: serialize directly, skipping
+    # response_model re-validation
+    leases = await asyncio.to_thread(
+        dhcp_service.get_leases_for_subnet, subnet.network
+    )
+    return Response(
+        content=orjson.dumps([lease.model_dump() for lease in leases]),
+        media_type="application/json"
+    )
 
 
 # ============================================================
 #  OPTIONS
 # ============================================================
 
+# Prebuilt statements for the option listings (bound per request)
+_OPTION_READ_COLUMNS = [
+    getattr(DhcpOption, name) for name in DhcpOptionRead.model_fields
+]
+_SELECT_SUBNET_OPTIONS = select(*_OPTION_READ_COLUMNS).where(
+    DhcpOption.subnet_id == bindparam("subnet_id")
+)
+_SELECT_GLOBAL_OPTIONS = select(*_OPTION_READ_COLUMNS).where(
+    DhcpOption.subnet_id.is_(None)
+)
+
+
 @router.get("/options", response_model=List[DhcpOptionRead])
 async def list_options(
+    request: Request,
     subnet_id: Optional[UUID] = None,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.view"))
+    _user: User = Depends(require_view)
 ):
     """
     List DHCP options.
     If subnet_id is provided, returns options for that subnet.
     If not, returns global options.
     """
+    # Select only the response columns (no ORM instances)
     if subnet_id:
         result = await session.execute(
-            select(DhcpOption).where(DhcpOption.subnet_id == subnet_id)
+            _SELECT_SUBNET_OPTIONS, {"subnet_id": subnet_id}
         )
     else:
-        result = await session.execute(
-            select(DhcpOption).where(DhcpOption.subnet_id == None)
-        )
-    return result.scalars().all()
+        result = await session.execute(_SELECT_GLOBAL_OPTIONS)
+    # Rows carry exactly the DhcpOptionRead columns: serialize directly,
+    # skipping response_model re-validation
+    payload = orjson.dumps([dict(row) for row in result.mappings()])
+    return _json_response(request, payload, make_etag(payload))
 
 
 @router.post("/options", response_model=DhcpOptionRead,
@@ -640,23 +687,27 @@ async def list_options(
 async def create_option(
     data: DhcpOptionCreate,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Create a DHCP option (global or per-subnet)."""
-    if data.subnet_id:
+    # Core INSERT ... RETURNING: SQLAlchemy binds the id from the column's
+    # uuid4 default and the row is returned in the same statement (no ORM
+    # unit of work)
+    try:
         result = await session.execute(
-            select(DhcpSubnet).where(DhcpSubnet.id == data.subnet_id)
+            insert(DhcpOption)
+            .values(**data.dict())
+            .returning(*_OPTION_READ_COLUMNS)
+        )
+        option = dict(result.mappings().one())
+        await session.commit()
+    except IntegrityError:
+        # The only constraint on dhcp_option is the subnet foreign key
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subnet not found"
         )
-        if not result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Subnet not found"
-            )
-
-    option = DhcpOption(**data.dict())
-    session.add(option)
-    await session.commit()
-    await session.refresh(option)
 
     return option
 
@@ -666,18 +717,18 @@ async def create_option(
 async def delete_option(
     option_id: UUID,
     session: AsyncSession = Depends(get_session),
-    _user: User = Depends(require_permission("dhcp.manage"))
+    _user: User = Depends(require_manage)
 ):
     """Delete a DHCP option."""
     result = await session.execute(
-        select(DhcpOption).where(DhcpOption.id == option_id)
+        delete(DhcpOption)
+        .where(DhcpOption.id == option_id)
+        .returning(DhcpOption.id)
     )
-    option = result.scalar_one_or_none()
-    if not option:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Option not found"
         )
 
-    await session.delete(option)
     await session.commit()
@@ -5,13 +5,17 @@ Business logic for DHCP operations: config generation, lease parsing,
 service management, and network interface discovery.
 """
 import subprocess
+import hashlib
 import logging
+import time
 import re
 import ipaddress
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, NamedTuple
 from jinja2 import Template
+import orjson
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
@@ -26,6 +30,47 @@ DHCPD_DEFAULTS_PATH = Path("/etc/default/isc-dhcp-server")
 DHCPD_LEASES_PATH = Path("/var/lib/dhcp/dhcpd.leases")
 SERVICE_NAME = "isc-dhcp-server"
 
+# How long discovered interfaces are reused before rescanning (seconds)
+INTERFACES_CACHE_TTL = 5.0
+# Upper bound on reusing parsed leases (expiry is evaluated at parse time)
+LEASES_CACHE_TTL = 2.0
+
+# Precompiled validation patterns
+MAC_ADDRESS_RE = re.compile(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$')
+
+
+@lru_cache(maxsize=256)
+def _parse_network(network_cidr: str) -> ipaddress.IPv4Network:
+    """Parse a CIDR string, caching the result per string."""
+    return ipaddress.IPv4Network(network_cidr, strict=False)
+
+
+def make_etag(payload: bytes) -> str:
+    """Strong HTTP ETag derived from a response body."""
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+class _LeasesCacheEntry(NamedTuple):
+    """Result of the last leases file parse."""
+    mtime_ns: int
+    cached_at: float                # time.monotonic() of the parse
+    leases: List[DhcpLeaseInfo]
+    ip_ints: List[Optional[int]]    # lease IPs as ints, same order
+    payload: Optional[bytes] = None  # JSON of leases, filled on first use
+    etag: Optional[str] = None
+
+
+def _lease_ip_ints(leases: List[DhcpLeaseInfo]) -> List[Optional[int]]:
+    """Convert lease IPs to integers (None for unparseable addresses)."""
+    ip_ints = []
+    for lease in leases:
+        try:
+            ip_ints.append(int(ipaddress.IPv4Address(lease.ip_address)))
+        except ValueError:
+            ip_ints.append(None)
+    return ip_ints
+
+
 # Config template (Jinja2)
 DHCPD_CONF_TEMPLATE = Template("""\
 # =============================================================
@@ -82,14 +127,33 @@ subnet {{ subnet.network_address }} netmask {{ subnet.netmask }} {
 class DhcpService:
     """Service class for DHCP operations."""
 
+    def __init__(self):
+        # (monotonic timestamp, interfaces) from the last scan
+        self._interfaces_cache: Optional[tuple] = None
+        self._leases_cache: Optional[_LeasesCacheEntry] = None
+
     # --- Network Interface Discovery ---
 
-    def get_physical_interfaces(self) -> List[Dict]:
+    def get_physical_interfaces(self, use_cache: bool = True) -> List[Dict]:
         """
         List physical network interfaces.
         Returns interfaces suitable for DHCP binding.
         Excludes: lo, wg*, veth*, docker*, br*, virbr*, tun*, tap*
+
+        Results are reused for INTERFACES_CACHE_TTL seconds unless
+        use_cache is False.
         """
+        if use_cache and self._interfaces_cache is not None:
+            cached_at, cached = self._interfaces_cache
+            if time.monotonic() - cached_at < INTERFACES_CACHE_TTL:
+                return cached
+
+        interfaces = self._scan_interfaces()
+        self._interfaces_cache = (time.monotonic(), interfaces)
+        return interfaces
+
+    def _scan_interfaces(self) -> List[Dict]:
+        """Scan /sys/class/net and `ip addr` for physical interfaces."""
         interfaces = []
         net_dir = Path("/sys/class/net")
 
@@ -155,7 +219,7 @@ class DhcpService:
 
         # Load global options (subnet_id IS NULL)
         result = await session.execute(
-            select(DhcpOption).where(DhcpOption.subnet_id == None)
+            select(DhcpOption).where(DhcpOption.subnet_id.is_(None))
         )
         global_options = result.scalars().all()
 
@@ -492,8 +556,8 @@ class DhcpService:
             )
             enabled_subnets = result.scalars().all()
 
-            # 1. Pre-flight: validate subnet-interface match
-            interfaces = self.get_physical_interfaces()
+            # 1. Pre-flight: validate subnet-interface match (fresh scan)
+            interfaces = self.get_physical_interfaces(use_cache=False)
             valid, msg = self._validate_subnet_interface_match(
                 enabled_subnets, interfaces
             )
@@ -527,11 +591,50 @@ class DhcpService:
         """
         Parse /var/lib/dhcp/dhcpd.leases file.
         Returns list of active leases.
+
+        The parsed list is reused while the file's mtime is unchanged and
+        for at most LEASES_CACHE_TTL seconds. Callers must not mutate it.
         """
-        leases = []
+        try:
+            mtime_ns = DHCPD_LEASES_PATH.stat().st_mtime_ns
+        except OSError:
+            return []
+
+        cache = self._leases_cache
+        if (cache is not None and cache.mtime_ns == mtime_ns
+                and time.monotonic() - cache.cached_at < LEASES_CACHE_TTL):
+            return cache.leases
+
+        leases = self._parse_leases_file()
+        self._leases_cache = _LeasesCacheEntry(
+            mtime_ns=mtime_ns,
+            cached_at=time.monotonic(),
+            leases=leases,
+            ip_ints=_lease_ip_ints(leases)
+        )
+        return leases
 
-        if not DHCPD_LEASES_PATH.exists():
-            return leases
+    def get_leases_json(self) -> tuple:
+        """
+        Active leases serialized to JSON, as (payload, etag).
+        Serialized once per lease cache entry and reused until it expires.
+        """
+        leases = self.parse_leases()
+        cache = self._leases_cache
+        if cache is None or cache.leases is not leases:
+            # Leases file missing: nothing cached
+            payload = orjson.dumps([lease.model_dump() for lease in leases])
+            return payload, make_etag(payload)
+
+        if cache.payload is None:
+            payload = orjson.dumps([lease.model_dump() for lease in leases])
+            cache = cache._replace(payload=payload, etag=make_etag(payload))
+            self._leases_cache = cache
+        return cache.payload, cache.etag
+
+    def _parse_leases_file(self) -> List[DhcpLeaseInfo]:
+        """Read and parse the leases file, keeping active leases only."""
+        leases = []
 
         try:
             content = DHCPD_LEASES_PATH.read_text()
@@ -612,19 +715,33 @@ class DhcpService:
         return leases
 
     def get_leases_for_subnet(
-        self, subnet_network: str
+        self, subnet_network: str,
+        leases: Optional[List[DhcpLeaseInfo]] = None
     ) -> List[DhcpLeaseInfo]:
-        """Get active leases filtered by subnet."""
-        all_leases = self.parse_leases()
+        """
+        Get active leases filtered by subnet.
+        Pass already-parsed leases to avoid re-reading the leases file.
+        """
+        all_leases = self.parse_leases() if leases is None else leases
         try:
-            network = ipaddress.IPv4Network(subnet_network, strict=False)
-            return [
-                lease for lease in all_leases
-                if ipaddress.IPv4Address(lease.ip_address) in network
-            ]
+            network = _parse_network(subnet_network)
         except ValueError:
             return all_leases
 
+        # Integer containment: (ip & netmask) == network address
+        net_int = int(network.network_address)
+        mask_int = int(network.netmask)
+        cache = self._leases_cache
+        if cache is not None and cache.leases is all_leases:
+            ip_ints = cache.ip_ints
+        else:
+            ip_ints = _lease_ip_ints(all_leases)
+
+        return [
+            lease for lease, ip_int in zip(all_leases, ip_ints)
+            if ip_int is not None and ip_int & mask_int == net_int
+        ]
+
     # --- Validation Helpers ---
 
     def validate_ip_in_subnet(
@@ -632,17 +749,14 @@ class DhcpService:
     ) -> bool:
         """Check if an IP address belongs to a subnet."""
         try:
-            network = ipaddress.IPv4Network(network_cidr, strict=False)
+            network = _parse_network(network_cidr)
             return ipaddress.IPv4Address(ip) in network
         except ValueError:
             return False
 
     def validate_mac_address(self, mac: str) -> bool:
         """Validate MAC address format."""
-        pattern = re.compile(
-            r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$'
-        )
-        return bool(pattern.match(mac))
+        return bool(MAC_ADDRESS_RE.match(mac))
 
     def validate_ip_range(
         self, start: str, end: str, network_cidr: str
@@ -652,7 +766,7 @@ class DhcpService:
         Returns (is_valid, error_message).
         """
         try:
-            network = ipaddress.IPv4Network(network_cidr, strict=False)
+            network = _parse_network(network_cidr)
             start_ip = ipaddress.IPv4Address(start)
             end_ip = ipaddress.IPv4Address(end)
 